@@ -0,0 +1,32 @@
+"""Coverage updates from the robot's camera field of view."""
+
+import math
+
+from environment import SearchEnvironment
+from robot import SearchRobot
+import config
+
+
+# Half of the horizontal FOV in radians (fixed by config)
+_HALF_FOV = math.radians(config.CAMERA_FOV_HORIZONTAL) / 2
+
+
+def update_from_robot(environment: SearchEnvironment, robot: SearchRobot):
+    """
+    Mark the grid cells inside the robot's camera view as seen.
+    
+    Skipped when the robot has moved less than a tenth of a grid cell and
+    turned less than 1° since the last update, as the cone can't have
+    revealed any new cells.
+    """
+    last_pose = robot._last_cov_pose
+    if last_pose is not None:
+        dx = robot.x - last_pose[0]
+        dy = robot.y - last_pose[1]
+        dh = (robot.heading - last_pose[2] + 180) % 360 - 180
+        if math.hypot(dx, dy) < environment.grid_size * 0.1 and abs(dh) < 1.0:
+            return
+    robot._last_cov_pose = (robot.x, robot.y, robot.heading)
+    
+    environment.mark_fov_cone(robot.x, robot.y, math.radians(robot.heading), _HALF_FOV,
+                              config.CAMERA_MIN_RANGE, config.CAMERA_MAX_RANGE)
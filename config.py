@@ -18,6 +18,7 @@ CAMERA_MIN_RANGE = 0.3  # meters (minimum range)
 # Simulation settings
 TIME_STEP = 0.1  # seconds per step
 UPDATE_INTERVAL = 50  # milliseconds between visualization updates
+REDRAW_3D_EVERY = 2  # redraw the 3D view every N visualization updates
 
 # Visualization settings
 SHOW_ROBOT_PATH = True
@@ -4,11 +4,13 @@ Quick demo showing how to run the visualization with a custom algorithm.
 Run this file directly instead of main.py if you want to test a single algorithm.
 """
 
+import math
 import numpy as np
 from environment import SearchEnvironment
 from robot import SearchRobot
 from visualizer import SearchVisualizer
 import config
+from camera_coverage import update_from_robot
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from matplotlib.widgets import Slider
@@ -23,7 +25,8 @@ def my_custom_algorithm(robot: SearchRobot, time_step: float):
     - angle_step_deg: Angular resolution between path points
     - max_radius: Maximum spiral radius before stopping
     
-    C++ generates the full path first, we follow it incrementally.
+    Like the C++ node, the full path is generated first; we then follow it
+    one waypoint at a time.
     """
     if not hasattr(robot, '_spiral_state'):
         # Configuration parameters (matching C++ node parameters)
@@ -35,13 +38,31 @@ def my_custom_algorithm(robot: SearchRobot, time_step: float):
             'max_radius': 10.0,  # maximum radius of spiral
             
             # Path following state
-            'current_angle_deg': 0.0,
+            'waypoint_idx': 0,
             'complete': False,
         }
         
         state = robot._spiral_state
         print(f"Spiral parameters: radius_step={state['radius_step']}m, "
               f"angle_step={state['angle_step_deg']}°, max_radius={state['max_radius']}m")
+        
+        # Generate every waypoint up to max_radius at once
+        max_angle = state['max_radius'] / state['radius_step'] * 360.0
+        angles = np.arange(0.0, max_angle + state['angle_step_deg'], state['angle_step_deg'])
+        radii = (angles / 360.0) * state['radius_step']
+        keep = radii <= state['max_radius']
+        angles, radii = angles[keep], radii[keep]
+        
+        angles_rad = np.radians(angles)
+        waypoints = np.stack([state['start_x'] + radii * np.sin(angles_rad),
+                              state['start_y'] + radii * np.cos(angles_rad)], -1)
+        
+        # Use a dynamic threshold based on radius to avoid getting stuck
+        thresholds = np.maximum(0.15, radii * 0.05)  # 5% of radius or 15cm minimum
+        
+        # Plain floats keep the per-step scalar math off NumPy's ufunc path
+        state['waypoints'] = waypoints.tolist()
+        state['thresholds_sq'] = (thresholds * thresholds).tolist()
     
     state = robot._spiral_state
     
@@ -49,48 +70,36 @@ def my_custom_algorithm(robot: SearchRobot, time_step: float):
     if state['complete']:
         return
     
-    # Calculate current radius based on angle
-    current_radius = (state['current_angle_deg'] / 360.0) * state['radius_step']
+    waypoints = state['waypoints']
+    idx = state['waypoint_idx']
     
-    # Check if we've exceeded max radius
-    if current_radius > state['max_radius']:
+    # Check if we've passed the last waypoint (exceeded max radius)
+    if idx >= len(waypoints):
         state['complete'] = True
         print("Spiral complete!")
         return
     
-    # Calculate current target position on spiral
-    angle_rad = np.radians(state['current_angle_deg'])
-    target_x = state['start_x'] + current_radius * np.sin(angle_rad)
-    target_y = state['start_y'] + current_radius * np.cos(angle_rad)
-    
-    # Calculate distance to target
+    # Calculate distance to current target
+    target_x, target_y = waypoints[idx]
     dx = target_x - robot.x
     dy = target_y - robot.y
-    distance_to_target = np.sqrt(dx**2 + dy**2)
     
-    # If we're close to the current target, increment angle to get next waypoint
-    # Use a dynamic threshold based on radius to avoid getting stuck
-    threshold = max(0.15, current_radius * 0.05)  # 5% of radius or 15cm minimum
-    
-    if distance_to_target < threshold:
-        # Move to next waypoint
-        state['current_angle_deg'] += state['angle_step_deg']
-        
-        # Recalculate target for new angle
-        current_radius = (state['current_angle_deg'] / 360.0) * state['radius_step']
-        if current_radius > state['max_radius']:
+    # If we're close to the current target, advance to the next waypoint
+    # (compared squared to skip the square root)
+    if dx * dx + dy * dy < state['thresholds_sq'][idx]:
+        idx += 1
+        state['waypoint_idx'] = idx
+        if idx >= len(waypoints):
             state['complete'] = True
             return
         
-        angle_rad = np.radians(state['current_angle_deg'])
-        target_x = state['start_x'] + current_radius * np.sin(angle_rad)
-        target_y = state['start_y'] + current_radius * np.cos(angle_rad)
+        target_x, target_y = waypoints[idx]
         dx = target_x - robot.x
         dy = target_y - robot.y
     
     # Calculate heading toward target
     if abs(dx) > 0.001 or abs(dy) > 0.001:
-        target_heading = np.degrees(np.arctan2(dx, dy))
+        target_heading = math.degrees(math.atan2(dx, dy))
         
         # Calculate angle difference (normalized to [-180, 180])
         angle_diff = target_heading - robot.heading
@@ -102,7 +111,7 @@ def my_custom_algorithm(robot: SearchRobot, time_step: float):
         # Smooth turning with rate limit
         max_turn = 180 * time_step  # 180 deg/sec - faster turning
         if abs(angle_diff) > max_turn:
-            robot.turn(np.sign(angle_diff) * max_turn)
+            robot.turn(math.copysign(max_turn, angle_diff))
         else:
             robot.set_heading(target_heading)
     
@@ -149,7 +158,7 @@ def run_demo():
     )
     
     # Store simulation speed multiplier
-    sim_speed = {'multiplier': 1.0}
+    sim_speed = {'multiplier': 1.0, 'accum': 0.0}
     
     def update_speed(val):
         sim_speed['multiplier'] = val
@@ -164,25 +173,26 @@ def run_demo():
         
         for _ in range(steps):
             robot.step(config.TIME_STEP)
-            _update_coverage(robot, environment)
+            update_from_robot(environment, robot)
         
-        # Handle fractional step
-        if fraction > 0 and np.random.random() < fraction:
+        # Handle fractional step: accumulate the remainder and take an
+        # extra step each time it adds up to a whole one
+        sim_speed['accum'] += fraction
+        if sim_speed['accum'] >= 1.0:
+            sim_speed['accum'] -= 1.0
             robot.step(config.TIME_STEP)
-            _update_coverage(robot, environment)
-        
-        visualizer.update(frame)
+            update_from_robot(environment, robot)
         
-        return visualizer.ax_2d, visualizer.ax_3d
+        return visualizer.update(frame)
     
     print("🚀 Running custom algorithm demo...")
     print("📝 Edit my_custom_algorithm() in demo.py to test your own algorithm!")
     print("🎚️  Use the slider at the bottom to adjust simulation speed!\n")
     
     anim = FuncAnimation(
-        visualizer.fig, animate,
+        visualizer.fig, animate, init_func=visualizer.init_plot,
         frames=2000, interval=config.UPDATE_INTERVAL,
-        blit=False, repeat=False
+        blit=True, repeat=False, cache_frame_data=False
     )
     
     plt.show()
@@ -190,24 +200,5 @@ def run_demo():
     print(f"\n✅ Final coverage: {environment.get_coverage_percentage():.1f}%")
 
 
-def _update_coverage(robot, environment):
-    """Helper function to update coverage based on robot's camera view."""
-    visible_cells = set()
-    heading_rad = np.radians(robot.heading)
-    fov_rad = np.radians(config.CAMERA_FOV_HORIZONTAL)
-    half_fov = fov_rad / 2
-    
-    for angle_offset in np.linspace(-half_fov, half_fov, 30):
-        direction_angle = heading_rad + angle_offset
-        for distance in np.linspace(config.CAMERA_MIN_RANGE, config.CAMERA_MAX_RANGE, 20):
-            px = robot.x + distance * np.sin(direction_angle)
-            py = robot.y + distance * np.cos(direction_angle)
-            grid_x, grid_y = environment.world_to_grid(px, py)
-            if environment.is_within_bounds(grid_x, grid_y):
-                visible_cells.add((grid_x, grid_y))
-    
-    environment.mark_cells_as_seen(visible_cells)
-
-
 if __name__ == "__main__":
     run_demo()
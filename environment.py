@@ -1,7 +1,34 @@
 """Search environment with grid-based coverage tracking."""
 
 import numpy as np
-from typing import Tuple, Set
+from typing import NamedTuple, Tuple, Set, Optional
+
+from fov_kernels import HAS_NUMBA, shadowcast_fov, cone_overlap_block
+
+
+if hasattr(np, 'bitwise_count'):
+    def _popcount(words: np.ndarray) -> int:
+        """Count the set bits in an array of uint64 words."""
+        return int(np.bitwise_count(words).sum())
+else:  # NumPy < 2.0
+    def _popcount(words: np.ndarray) -> int:
+        """Count the set bits in an array of uint64 words."""
+        return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+def _pack_rows(grid: np.ndarray) -> np.ndarray:
+    """Pack a boolean grid into rows of uint64 words (bit k = column k)."""
+    n_words = (grid.shape[1] + 63) // 64
+    packed = np.packbits(grid, axis=1, bitorder='little')
+    padded = np.zeros((grid.shape[0], n_words * 8), dtype=np.uint8)
+    padded[:, :packed.shape[1]] = packed
+    return padded.view('<u8').astype(np.uint64)
+
+
+class CoverageSnapshot(NamedTuple):
+    """Coverage state captured by ``SearchEnvironment.snapshot_coverage``."""
+    rows: np.ndarray
+    seen_count: int
 
 
 class SearchEnvironment:
@@ -20,26 +47,81 @@ class SearchEnvironment:
         self.diameter = radius * 2
         self.grid_cells = int(self.diameter / grid_size)
         
-        # Coverage grid: True if cell has been seen, False otherwise
-        self.coverage_grid = np.zeros((self.grid_cells, self.grid_cells), dtype=bool)
+        # Coverage bitmap: one bit per cell, set once the cell has been seen.
+        # Each grid row is packed into uint64 words, column k in bit k % 64
+        # of word k // 64.
+        self._rows = np.zeros((self.grid_cells, (self.grid_cells + 63) // 64),
+                              dtype=np.uint64)
+        
+        # Scratch buffer for one batch of marks (flat index grid_y * N + grid_x);
+        # duplicates collapse for free before the batch is packed into _rows
+        self._touched = np.zeros(self.grid_cells * self.grid_cells, dtype=bool)
         
         # Center of the search area (in grid coordinates)
         self.center = self.grid_cells // 2
+        
+        # Cells whose centers lie inside the circular search area
+        rows, cols = np.indices((self.grid_cells, self.grid_cells))
+        x, y = self.grid_to_world(cols, rows)
+        self._circle_mask = (x * x + y * y) <= radius * radius
+        self._circle_mask.flags.writeable = False
+        self._circle_rows = _pack_rows(self._circle_mask)
+        self._total_in_circle = _popcount(self._circle_rows)
+        
+        # Seen cells inside the circle, updated as cells are newly marked
+        self._seen_count = 0
     
-    def world_to_grid(self, x: float, y: float) -> Tuple[int, int]:
+    @property
+    def coverage_grid(self) -> np.ndarray:
+        """
+        Read-only boolean (grid_cells, grid_cells) unpacking of the coverage bitmap.
+        
+        True if cell has been seen, False otherwise. Item writes raise an
+        error; mark cells as seen or assign a whole grid to update coverage.
+        """
+        as_bytes = self._rows.astype('<u8', copy=False).view(np.uint8)
+        bits = np.unpackbits(as_bytes, axis=1, count=self.grid_cells, bitorder='little')
+        bits.flags.writeable = False
+        return bits.view(bool)
+    
+    @coverage_grid.setter
+    def coverage_grid(self, grid: np.ndarray):
+        self._rows = _pack_rows(np.asarray(grid, dtype=bool))
+        self._seen_count = _popcount(self._rows & self._circle_rows)
+    
+    @property
+    def seen_count(self) -> int:
+        """Number of cells inside the search circle that have been seen."""
+        return self._seen_count
+    
+    @property
+    def circle_mask(self) -> np.ndarray:
+        """Read-only boolean grid of the cells inside the circular search area."""
+        return self._circle_mask
+    
+    def world_to_grid(self, x, y, clip: bool = False) -> Tuple[np.ndarray, np.ndarray]:
         """
         Convert world coordinates to grid coordinates.
         World coordinates: center is (0, 0), range is [-radius, +radius]
         Grid coordinates: top-left is (0, 0), range is [0, grid_cells-1]
+        
+        Accepts scalars or arrays and returns int32 indices of the same
+        shape. With ``clip`` set, points outside the grid map to the
+        nearest edge cell.
         """
-        grid_x = int((x + self.radius) / self.grid_size)
-        grid_y = int((y + self.radius) / self.grid_size)
+        inv_grid_size = 1.0 / self.grid_size
+        grid_x = np.floor((np.asarray(x) + self.radius) * inv_grid_size).astype(np.int32)
+        grid_y = np.floor((np.asarray(y) + self.radius) * inv_grid_size).astype(np.int32)
+        if clip:
+            grid_x = np.clip(grid_x, 0, self.grid_cells - 1)
+            grid_y = np.clip(grid_y, 0, self.grid_cells - 1)
         return grid_x, grid_y
     
-    def grid_to_world(self, grid_x: int, grid_y: int) -> Tuple[float, float]:
-        """Convert grid coordinates to world coordinates."""
-        x = grid_x * self.grid_size - self.radius + self.grid_size / 2
-        y = grid_y * self.grid_size - self.radius + self.grid_size / 2
+    def grid_to_world(self, grid_x, grid_y) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert grid coordinates (scalars or arrays) to world coordinates of cell centers."""
+        offset = self.grid_size / 2 - self.radius
+        x = np.asarray(grid_x) * self.grid_size + offset
+        y = np.asarray(grid_y) * self.grid_size + offset
         return x, y
     
     def is_within_bounds(self, grid_x: int, grid_y: int) -> bool:
@@ -48,31 +130,97 @@ class SearchEnvironment:
     
     def is_within_search_area(self, x: float, y: float) -> bool:
         """Check if world coordinates are within the circular search area."""
-        distance = np.sqrt(x**2 + y**2)
-        return distance <= self.radius
+        return x * x + y * y <= self.radius * self.radius
     
     def mark_cells_as_seen(self, cells: Set[Tuple[int, int]]):
         """Mark a set of grid cells as seen."""
-        for grid_x, grid_y in cells:
-            if self.is_within_bounds(grid_x, grid_y):
-                self.coverage_grid[grid_y, grid_x] = True
+        cells = [cell for cell in cells if self.is_within_bounds(*cell)]
+        if cells:
+            grid_x, grid_y = np.array(cells).T
+            self.mark_cells_as_seen_arr(grid_x, grid_y)
+    
+    def mark_cells_as_seen_arr(self, grid_x: np.ndarray, grid_y: np.ndarray):
+        """
+        Mark grid cells given as index arrays as seen.
+        
+        Callers must already have clipped the indices to the grid bounds.
+        """
+        if len(grid_y) == 0:
+            return
+        self._touched[grid_y * self.grid_cells + grid_x] = True
+        self._flush_touched(int(grid_y.min()), int(grid_y.max()) + 1)
+    
+    def mark_fov_cone(self, x: float, y: float, heading_rad: float,
+                      half_fov: float, min_range: float, max_range: float):
+        """
+        Mark every cell inside a camera's field of view cone as seen.
+        
+        Args:
+            x, y: Camera position in world coordinates
+            heading_rad: Camera heading in radians (0 = North/+Y)
+            half_fov: Half of the horizontal FOV in radians
+            min_range, max_range: Camera range limits in meters
+        """
+        if HAS_NUMBA:
+            self._seen_count += shadowcast_fov(x, y, heading_rad, half_fov, min_range, max_range,
+                                               self.radius, self.grid_size, self.grid_cells,
+                                               self._rows, self._circle_rows)
+        else:
+            self.mark_block_as_seen(*cone_overlap_block(x, y, heading_rad, half_fov,
+                                                        min_range, max_range, self.radius,
+                                                        self.grid_size, self.grid_cells))
+    
+    def mark_block_as_seen(self, grid_x: int, grid_y: int, block: np.ndarray):
+        """
+        Mark the True cells of a boolean block as seen.
+        
+        The block's [0, 0] cell lands on (grid_x, grid_y); parts that fall
+        outside the grid are clipped.
+        """
+        n = self.grid_cells
+        height, width = block.shape
+        x0, y0 = max(grid_x, 0), max(grid_y, 0)
+        x1, y1 = min(grid_x + width, n), min(grid_y + height, n)
+        if x0 >= x1 or y0 >= y1:
+            return
+        
+        touched = self._touched.reshape(n, n)
+        touched[y0:y1, x0:x1] |= block[y0 - grid_y:y1 - grid_y, x0 - grid_x:x1 - grid_x]
+        self._flush_touched(y0, y1)
+    
+    def _flush_touched(self, row_start: int = 0, row_stop: Optional[int] = None):
+        """
+        OR the touched buffer into the coverage bitmap and clear it.
+        
+        Only rows [row_start, row_stop) are packed, so callers that know
+        which rows they touched skip packing the rest of the grid.
+        """
+        n = self.grid_cells
+        touched = self._touched.reshape(n, n)[row_start:row_stop]
+        rows = self._rows[row_start:row_stop]
+        packed = _pack_rows(touched)
+        self._seen_count += _popcount(packed & ~rows & self._circle_rows[row_start:row_stop])
+        rows |= packed
+        touched.fill(False)
     
     def get_coverage_percentage(self) -> float:
         """Calculate percentage of search area covered."""
-        # Only count cells within the circular search radius
-        total_cells = 0
-        seen_cells = 0
-        
-        for i in range(self.grid_cells):
-            for j in range(self.grid_cells):
-                x, y = self.grid_to_world(j, i)
-                if self.is_within_search_area(x, y):
-                    total_cells += 1
-                    if self.coverage_grid[i, j]:
-                        seen_cells += 1
+        if self._total_in_circle == 0:
+            return 0.0
         
-        return (seen_cells / total_cells * 100) if total_cells > 0 else 0.0
+        # Only cells within the circular search radius are counted
+        return 100.0 * self._seen_count / self._total_in_circle
+    
+    def snapshot_coverage(self) -> CoverageSnapshot:
+        """Capture a copy of the current coverage."""
+        return CoverageSnapshot(self._rows.copy(), self._seen_count)
+    
+    def restore_coverage(self, snapshot: CoverageSnapshot):
+        """Return to coverage captured by ``snapshot_coverage`` on a same-sized grid."""
+        self._rows[...] = snapshot.rows
+        self._seen_count = snapshot.seen_count
     
     def reset_coverage(self):
         """Reset all coverage data."""
-        self.coverage_grid.fill(False)
+        self._rows.fill(0)
+        self._seen_count = 0
@@ -0,0 +1,336 @@
+"""Compiled kernels for marking the camera field of view on the coverage grid.
+
+Numba is optional. When it is not installed, ``cone_overlap_block``
+applies the same cell test with NumPy array operations over the cone's
+bounding box, marking exactly the same cells.
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for ``numba.njit`` that leaves the function uncompiled."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Octant multipliers: each octant spans 45 degrees of heading and is swept
+# row by row along its major axis, stepping sideways along its minor axis.
+# Octant k covers headings [45k, 45k + 45] (0 = North/+Y, clockwise).
+_MAJOR_X = np.array([0, 1, 1, 0, 0, -1, -1, 0])
+_MAJOR_Y = np.array([1, 0, 0, -1, -1, 0, 0, 1])
+_MINOR_X = np.array([1, 0, 0, 1, -1, 0, 0, -1])
+_MINOR_Y = np.array([0, 1, -1, 0, 0, -1, 1, 0])
+
+# Cells of slack around each swept row, enough to reach every cell that
+# overlaps the cone wherever the camera sits inside its own cell
+_SLACK = 3
+
+
+@njit(cache=True, fastmath=True)
+def _clip_half_plane(xs, ys, n, normal_x, normal_y, out_xs, out_ys):
+    """
+    Clip a convex polygon to the half plane normal . p >= 0 (Sutherland-Hodgman).
+
+    Reads the first ``n`` vertices of ``xs``/``ys``, writes the clipped
+    polygon to ``out_xs``/``out_ys`` and returns its vertex count.
+    """
+    count = 0
+    for i in range(n):
+        j = (i + 1) % n
+        side_i = normal_x * xs[i] + normal_y * ys[i]
+        side_j = normal_x * xs[j] + normal_y * ys[j]
+        if side_i >= 0:
+            out_xs[count] = xs[i]
+            out_ys[count] = ys[i]
+            count += 1
+        if (side_i >= 0) != (side_j >= 0):
+            t = side_i / (side_i - side_j)
+            out_xs[count] = xs[i] + t * (xs[j] - xs[i])
+            out_ys[count] = ys[i] + t * (ys[j] - ys[i])
+            count += 1
+    return count
+
+
+@njit(cache=True, fastmath=True)
+def _cell_overlaps_cone(wx, wy, half_cell, lo_x, lo_y, hi_x, hi_y,
+                        dmin_sq, dmax_sq, xs, ys, tmp_xs, tmp_ys):
+    """
+    Whether any part of a cell lies inside the camera's annular sector.
+
+    The cell is clipped to the cone's wedge (two half planes, as the FOV
+    is under 180 degrees). Distance from the camera is continuous over
+    the clipped convex polygon, so the cell overlaps the sector exactly
+    when the polygon's nearest point is within max range and its farthest
+    point is beyond min range.
+
+    Args:
+        wx, wy: Cell center relative to the camera
+        half_cell: Half of the cell size
+        lo_x, lo_y, hi_x, hi_y: Unit vectors along the cone's two edges
+        dmin_sq, dmax_sq: Squared minimum and maximum camera range
+        xs, ys, tmp_xs, tmp_ys: Scratch vertex buffers of length 8
+    """
+    xs[0] = wx - half_cell
+    ys[0] = wy - half_cell
+    xs[1] = wx + half_cell
+    ys[1] = wy - half_cell
+    xs[2] = wx + half_cell
+    ys[2] = wy + half_cell
+    xs[3] = wx - half_cell
+    ys[3] = wy + half_cell
+
+    # Headings turn clockwise, so the wedge lies clockwise of its low edge
+    # and counter-clockwise of its high edge
+    n = _clip_half_plane(xs, ys, 4, lo_y, -lo_x, tmp_xs, tmp_ys)
+    n = _clip_half_plane(tmp_xs, tmp_ys, n, -hi_y, hi_x, xs, ys)
+    if n == 0:
+        return False
+
+    far_sq = 0.0
+    for i in range(n):
+        far_sq = max(far_sq, xs[i] * xs[i] + ys[i] * ys[i])
+    if far_sq < dmin_sq:
+        return False
+
+    # The camera sits on the wedge's apex, so it is in the polygon exactly
+    # when it is in the cell
+    if abs(wx) <= half_cell and abs(wy) <= half_cell:
+        return True
+
+    for i in range(n):
+        j = (i + 1) % n
+        edge_x = xs[j] - xs[i]
+        edge_y = ys[j] - ys[i]
+        length_sq = edge_x * edge_x + edge_y * edge_y
+        t = 0.0
+        if length_sq > 0:
+            t = min(max(-(xs[i] * edge_x + ys[i] * edge_y) / length_sq, 0.0), 1.0)
+        near_x = xs[i] + t * edge_x
+        near_y = ys[i] + t * edge_y
+        if near_x * near_x + near_y * near_y <= dmax_sq:
+            return True
+    return False
+
+
+@njit(cache=True, fastmath=True)
+def shadowcast_fov(x, y, heading_rad, half_fov, dmin, dmax,
+                   radius, grid_size, grid_cells, rows_out, count_rows):
+    """
+    Mark every cell that the FOV cone covers, even partially, as seen.
+
+    Uses shadowcasting restricted to the octants the cone overlaps. The
+    search area has no blockers, so the recursion never splits and each
+    octant reduces to one sweep of rows bounded by the cone's slopes.
+
+    Args:
+        x, y: Camera position in world coordinates
+        heading_rad: Camera heading in radians (0 = North/+Y)
+        half_fov: Half of the horizontal FOV in radians (less than 90°)
+        dmin, dmax: Minimum and maximum camera range in meters
+        radius: Search radius in meters (grid origin offset)
+        grid_size: Size of each grid cell in meters
+        grid_cells: Number of cells along each grid axis
+        rows_out: Packed coverage bitmap (see ``SearchEnvironment._rows``),
+            updated in place
+        count_rows: Packed bitmap, shaped like ``rows_out``, of the cells
+            to count (e.g. the search circle)
+
+    Returns:
+        Number of cells in ``count_rows`` that were newly marked as seen
+    """
+    octant = math.pi / 4
+    sin_h = math.sin(heading_rad)
+    cos_h = math.cos(heading_rad)
+    cos_half = math.cos(half_fov)
+    dmin_sq = dmin * dmin
+    dmax_sq = dmax * dmax
+    newly_seen = 0
+
+    # Unit vectors along the cone's edges and scratch space for clipping
+    lo_x = math.sin(heading_rad - half_fov)
+    lo_y = math.cos(heading_rad - half_fov)
+    hi_x = math.sin(heading_rad + half_fov)
+    hi_y = math.cos(heading_rad + half_fov)
+    half_cell = 0.5 * grid_size
+    half_diag = half_cell * math.sqrt(2.0)
+    xs = np.empty(8)
+    ys = np.empty(8)
+    tmp_xs = np.empty(8)
+    tmp_ys = np.empty(8)
+
+    inv_grid_size = 1.0 / grid_size
+    origin_x = int(math.floor((x + radius) * inv_grid_size))
+    origin_y = int(math.floor((y + radius) * inv_grid_size))
+    n_rows = int(dmax * inv_grid_size) + _SLACK + 1
+
+    # Offset from a cell's index-scaled corner to its center, relative to the camera
+    center_x = 0.5 * grid_size - radius - x
+    center_y = 0.5 * grid_size - radius - y
+
+    for k in range(8):
+        # Part of the cone inside this octant, relative to its start angle
+        start = (heading_rad - half_fov - k * octant) % (2 * math.pi)
+        end = start + 2 * half_fov
+        if start <= octant:
+            lo = start
+            hi = min(end, octant)
+        elif end >= 2 * math.pi:
+            lo = 0.0
+            hi = min(end - 2 * math.pi, octant)
+        else:
+            continue
+
+        # Odd octants are swept from their far edge
+        if k % 2 == 1:
+            lo, hi = octant - hi, octant - lo
+        slope_lo = math.tan(lo)
+        slope_hi = math.tan(hi)
+
+        mx = _MAJOR_X[k]
+        my = _MAJOR_Y[k]
+        nx = _MINOR_X[k]
+        ny = _MINOR_Y[k]
+
+        for row in range(n_rows):
+            # The slack covers the camera's offset inside its cell and cells
+            # that only overlap the cone's edge, including ones just across
+            # the octant's boundaries (cells visited twice are marked once)
+            first = max(int(math.floor(row * slope_lo)) - _SLACK, -_SLACK)
+            last = min(int(math.ceil(row * slope_hi)) + _SLACK, row + _SLACK)
+
+            for col in range(first, last + 1):
+                grid_x = origin_x + row * mx + col * nx
+                grid_y = origin_y + row * my + col * ny
+                if not (0 <= grid_x < grid_cells and 0 <= grid_y < grid_cells):
+                    continue
+
+                # Cell center relative to the camera
+                wx = grid_x * grid_size + center_x
+                wy = grid_y * grid_size + center_y
+
+                # Cells with their center in the cone are covered; otherwise
+                # only those near the cone need the exact overlap test
+                dist_sq = wx * wx + wy * wy
+                inside = (dmin_sq <= dist_sq <= dmax_sq and
+                          wx * sin_h + wy * cos_h >= math.sqrt(dist_sq) * cos_half)
+                if not inside:
+                    # Skip cells wholly beyond max range or outside either edge
+                    near_x = max(abs(wx) - half_cell, 0.0)
+                    near_y = max(abs(wy) - half_cell, 0.0)
+                    if near_x * near_x + near_y * near_y > dmax_sq:
+                        continue
+                    if (lo_y * wx - lo_x * wy < -half_diag or
+                            hi_x * wy - hi_y * wx < -half_diag):
+                        continue
+                    inside = _cell_overlaps_cone(wx, wy, half_cell, lo_x, lo_y, hi_x, hi_y,
+                                                 dmin_sq, dmax_sq, xs, ys, tmp_xs, tmp_ys)
+                if inside:
+                    word = grid_x >> 6
+                    bit = np.uint64(1) << np.uint64(grid_x & 63)
+                    if not rows_out[grid_y, word] & bit:
+                        rows_out[grid_y, word] |= bit
+                        if count_rows[grid_y, word] & bit:
+                            newly_seen += 1
+
+    return newly_seen
+
+
+
+def _half_plane_sides(lo_x, lo_y, hi_x, hi_y, px, py):
+    """Signed sides of points against the cone's two edges (both >= 0 inside the wedge)."""
+    return lo_y * px - lo_x * py, hi_x * py - hi_y * px
+
+
+def cone_overlap_block(x, y, heading_rad, half_fov, dmin, dmax,
+                       radius, grid_size, grid_cells):
+    """
+    NumPy version of the cell test in ``shadowcast_fov``, for use without numba.
+
+    Applies the exact overlap rule of ``_cell_overlaps_cone`` to every cell
+    of the cone's bounding box at once. The wedge-clipped cell is convex,
+    so its vertices are the cell corners inside the wedge, the points where
+    the cone's edges cross the cell's sides, and the camera if it is in the
+    cell. Its farthest point is one of those vertices; its nearest point is
+    one of them or the foot of the camera on a cell side inside the wedge.
+
+    Args:
+        Same as the leading arguments of ``shadowcast_fov``
+
+    Returns:
+        (grid_x, grid_y, block): grid indices of the block's [0, 0] cell and
+        a boolean block of the cells the cone covers, even partially
+    """
+    inv_grid_size = 1.0 / grid_size
+    # Cells touching the box's edges are included, as range checks are inclusive
+    x0 = max(int(math.ceil((x - dmax + radius) * inv_grid_size)) - 1, 0)
+    y0 = max(int(math.ceil((y - dmax + radius) * inv_grid_size)) - 1, 0)
+    x1 = min(int(math.floor((x + dmax + radius) * inv_grid_size)) + 1, grid_cells)
+    y1 = min(int(math.floor((y + dmax + radius) * inv_grid_size)) + 1, grid_cells)
+    if x0 >= x1 or y0 >= y1:
+        return x0, y0, np.zeros((0, 0), dtype=bool)
+
+    lo_x = math.sin(heading_rad - half_fov)
+    lo_y = math.cos(heading_rad - half_fov)
+    hi_x = math.sin(heading_rad + half_fov)
+    hi_y = math.cos(heading_rad + half_fov)
+    half_cell = 0.5 * grid_size
+
+    # Cell centers relative to the camera, broadcast to (rows, cols)
+    wx = (np.arange(x0, x1) * grid_size + (half_cell - radius - x))[None, :]
+    wy = (np.arange(y0, y1) * grid_size + (half_cell - radius - y))[:, None]
+    shape = (y1 - y0, x1 - x0)
+
+    # Corners in counter-clockwise order, shaped (4, rows, cols)
+    corner_dx = np.array([-1.0, 1.0, 1.0, -1.0])[:, None, None] * half_cell
+    corner_dy = np.array([-1.0, -1.0, 1.0, 1.0])[:, None, None] * half_cell
+    cx = np.broadcast_to(wx + corner_dx, (4,) + shape)
+    cy = np.broadcast_to(wy + corner_dy, (4,) + shape)
+    side_lo, side_hi = _half_plane_sides(lo_x, lo_y, hi_x, hi_y, cx, cy)
+    corner_in = (side_lo >= 0) & (side_hi >= 0)
+    corner_sq = cx * cx + cy * cy
+
+    nonempty = corner_in.any(axis=0)
+    far_sq = np.where(corner_in, corner_sq, -1.0).max(axis=0)
+    near_sq = np.where(corner_in, corner_sq, np.inf).min(axis=0)
+
+    # Where each edge line of the cone crosses a cell side, if that point
+    # is also inside the other half plane
+    next_x = np.roll(cx, -1, axis=0)
+    next_y = np.roll(cy, -1, axis=0)
+    for sides, other_side in ((side_lo, 1), (side_hi, 0)):
+        next_sides = np.roll(sides, -1, axis=0)
+        crosses = (sides >= 0) != (next_sides >= 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(crosses, sides / (sides - next_sides), 0.0)
+        px = cx + t * (next_x - cx)
+        py = cy + t * (next_y - cy)
+        valid = crosses & (_half_plane_sides(lo_x, lo_y, hi_x, hi_y, px, py)[other_side] >= 0)
+        dist_sq = px * px + py * py
+        nonempty |= valid.any(axis=0)
+        far_sq = np.maximum(far_sq, np.where(valid, dist_sq, -1.0).max(axis=0))
+        near_sq = np.minimum(near_sq, np.where(valid, dist_sq, np.inf).min(axis=0))
+
+    # The camera's foot on each (axis-aligned) cell side, if it is in the wedge
+    foot_x = np.clip(0.0, np.minimum(cx, next_x), np.maximum(cx, next_x))
+    foot_y = np.clip(0.0, np.minimum(cy, next_y), np.maximum(cy, next_y))
+    foot_lo, foot_hi = _half_plane_sides(lo_x, lo_y, hi_x, hi_y, foot_x, foot_y)
+    foot_in = (foot_lo >= 0) & (foot_hi >= 0)
+    near_sq = np.minimum(near_sq, np.where(foot_in, foot_x * foot_x + foot_y * foot_y,
+                                           np.inf).min(axis=0))
+
+    # The camera is the wedge's apex, so it is in the clipped cell exactly
+    # when it is in the cell
+    camera_in = (np.abs(wx) <= half_cell) & (np.abs(wy) <= half_cell)
+    nonempty |= camera_in
+    near_sq = np.where(camera_in, 0.0, near_sq)
+
+    block = nonempty & (far_sq >= dmin * dmin) & (near_sq <= dmax * dmax)
+    return x0, y0, block
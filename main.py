@@ -1,5 +1,8 @@
 """Main entry point for URC robot search visualization."""
 
+import argparse
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
@@ -8,6 +11,7 @@ from matplotlib.widgets import Slider
 from environment import SearchEnvironment
 from robot import SearchRobot
 from visualizer import SearchVisualizer
+from camera_coverage import update_from_robot
 import config
 
 
@@ -179,7 +183,7 @@ def run_simulation(search_algorithm):
     )
     
     # Store simulation speed multiplier
-    sim_speed = {'multiplier': 1.0}
+    sim_speed = {'multiplier': 1.0, 'accum': 0.0}
     
     def update_speed(val):
         sim_speed['multiplier'] = val
@@ -196,41 +200,26 @@ def run_simulation(search_algorithm):
             # Execute search algorithm step
             robot.step(config.TIME_STEP)
             
-            # Calculate visible cells and mark as seen
-            visible_cells = set()
-            heading_rad = np.radians(robot.heading)
-            fov_rad = np.radians(config.CAMERA_FOV_HORIZONTAL)
-            half_fov = fov_rad / 2
-            
-            # Sample points in FOV cone
-            for angle_offset in np.linspace(-half_fov, half_fov, 30):
-                direction_angle = heading_rad + angle_offset
-                for distance in np.linspace(config.CAMERA_MIN_RANGE, config.CAMERA_MAX_RANGE, 20):
-                    px = robot.x + distance * np.sin(direction_angle)
-                    py = robot.y + distance * np.cos(direction_angle)
-                    
-                    # Convert to grid coordinates
-                    grid_x, grid_y = environment.world_to_grid(px, py)
-                    if environment.is_within_bounds(grid_x, grid_y):
-                        visible_cells.add((grid_x, grid_y))
-            
-            # Mark cells as seen
-            environment.mark_cells_as_seen(visible_cells)
+            # Mark cells in the camera view as seen
+            update_from_robot(environment, robot)
         
-        # Handle fractional step
-        if fraction > 0 and np.random.random() < fraction:
+        # Handle fractional step: accumulate the remainder and take an
+        # extra step each time it adds up to a whole one
+        sim_speed['accum'] += fraction
+        if sim_speed['accum'] >= 1.0:
+            sim_speed['accum'] -= 1.0
             robot.step(config.TIME_STEP)
-            # (Coverage update for fractional step - simplified)
+            update_from_robot(environment, robot)
         
         # Update visualization
-        visualizer.update(frame)
+        artists = visualizer.update(frame)
         
         # Print progress every 50 frames
         if frame % 50 == 0 and frame > 0:
             coverage = environment.get_coverage_percentage()
             print(f"   Frame {frame}: Coverage {coverage:.1f}%")
         
-        return visualizer.ax_2d, visualizer.ax_3d
+        return artists
     
     # Start simulation
     print(f"\n▶️  Starting simulation...")
@@ -240,10 +229,12 @@ def run_simulation(search_algorithm):
     anim = FuncAnimation(
         visualizer.fig,
         animate,
+        init_func=visualizer.init_plot,
         frames=2000,
         interval=config.UPDATE_INTERVAL,
-        blit=False,
-        repeat=False
+        blit=True,
+        repeat=False,
+        cache_frame_data=False
     )
     
     plt.show()
@@ -257,6 +248,17 @@ def run_simulation(search_algorithm):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="URC robot search visualization")
+    parser.add_argument('--algorithm', choices=['1', '2', '3', '4', '5'],
+                        help="search algorithm to run (prompts if omitted)")
+    parser.add_argument('--save', metavar='PATH',
+                        help="render offline to a video file (e.g. run.mp4) instead of opening a window")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="worker processes used to render with --save")
+    parser.add_argument('--frames', type=int, default=2000,
+                        help="number of frames to render with --save")
+    args = parser.parse_args()
+    
     # Choose which search algorithm to run
     ALGORITHMS = {
         '1': ('Spiral Search', spiral_search),
@@ -266,16 +268,27 @@ if __name__ == "__main__":
         '5': ('Star Pattern', star_pattern_search),
     }
     
-    print("\n🔍 Available Search Algorithms:")
-    for key, (name, _) in ALGORITHMS.items():
-        print(f"   {key}. {name}")
-    
-    choice = input("\nSelect algorithm (1-5) [default: 1]: ").strip() or '1'
+    if args.algorithm:
+        choice = args.algorithm
+    else:
+        print("\n🔍 Available Search Algorithms:")
+        for key, (name, _) in ALGORITHMS.items():
+            print(f"   {key}. {name}")
+        
+        choice = input("\nSelect algorithm (1-5) [default: 1]: ").strip() or '1'
     
     if choice in ALGORITHMS:
         name, algorithm = ALGORITHMS[choice]
         print(f"\n✓ Selected: {name}\n")
-        run_simulation(algorithm)
     else:
         print("Invalid choice. Using Spiral Search.")
-        run_simulation(spiral_search)
+        algorithm = spiral_search
+    
+    if args.save:
+        from offline_render import render_offline
+        try:
+            render_offline(algorithm, args.save, frames=args.frames, n_jobs=args.jobs)
+        except RuntimeError as e:
+            sys.exit(f"❌ Could not save video: {e}")
+    else:
+        run_simulation(algorithm)
@@ -0,0 +1,152 @@
+"""Offline rendering of a search run to a video file.
+
+The run is simulated first, capturing the robot pose and the coverage
+bitmap for every frame. The frames are then rendered to PNG in parallel
+worker processes, each with its own Agg figure, and piped to ffmpeg.
+The interactive ``FuncAnimation`` path in ``main.py`` is unaffected.
+"""
+
+import io
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, NamedTuple, Tuple
+
+import numpy as np
+import matplotlib
+import matplotlib.pyplot as plt
+
+from environment import CoverageSnapshot, SearchEnvironment
+from robot import RobotState, SearchRobot
+from visualizer import SearchVisualizer
+from camera_coverage import update_from_robot
+import config
+
+
+class FrameState(NamedTuple):
+    """Everything the visualizer needs to draw one frame."""
+    robot: RobotState
+    coverage: CoverageSnapshot
+
+
+def _make_environment() -> SearchEnvironment:
+    return SearchEnvironment(radius=config.SEARCH_RADIUS, grid_size=config.GRID_SIZE)
+
+
+def _make_robot() -> SearchRobot:
+    return SearchRobot(
+        start_x=config.ROBOT_START_POS[0],
+        start_y=config.ROBOT_START_POS[1],
+        speed=config.ROBOT_SPEED,
+        fov_h=config.CAMERA_FOV_HORIZONTAL,
+        fov_v=config.CAMERA_FOV_VERTICAL,
+        camera_range=config.CAMERA_MAX_RANGE
+    )
+
+
+def simulate(search_algorithm: Callable, frames: int) -> Tuple[List[FrameState], np.ndarray]:
+    """
+    Run the search without drawing and snapshot the state after each step.
+
+    Args:
+        search_algorithm: Function that takes (robot, time_step) and updates robot
+        frames: Number of frames (one simulation step each) to record
+
+    Returns:
+        The per-frame states and the full robot path; each state's robot
+        ``path_len`` indexes into that path.
+    """
+    environment = _make_environment()
+    robot = _make_robot()
+    robot.set_search_algorithm(search_algorithm)
+
+    states = []
+    for _ in range(frames):
+        robot.step(config.TIME_STEP)
+        update_from_robot(environment, robot)
+        states.append(FrameState(robot.snapshot(), environment.snapshot_coverage()))
+
+    return states, robot.path
+
+
+def _init_worker():
+    """Select the non-interactive backend in each worker process."""
+    matplotlib.use('Agg')
+
+
+def _render_chunk(first_frame: int, states: List[FrameState], path: np.ndarray) -> List[bytes]:
+    """Render a run of consecutive frames on a private figure and return PNG bytes."""
+    environment = _make_environment()
+    robot = _make_robot()
+    visualizer = SearchVisualizer(environment, robot)
+
+    # The replay robot holds the whole recorded path and only moves its end marker
+    robot.load_path(path)
+
+    pngs = []
+    for offset, state in enumerate(states):
+        robot.restore(state.robot)
+        environment.restore_coverage(state.coverage)
+
+        # Each frame is a full savefig, so throttling the 3D view saves nothing
+        visualizer.update(first_frame + offset, force_3d=True)
+        buffer = io.BytesIO()
+        visualizer.fig.savefig(buffer, format='png')
+        pngs.append(buffer.getvalue())
+
+    plt.close(visualizer.fig)
+    return pngs
+
+
+def render_offline(search_algorithm: Callable, output_path: str,
+                   frames: int = 2000, n_jobs: int = 1):
+    """
+    Simulate a search run and write it to a video file.
+
+    Args:
+        search_algorithm: Function that takes (robot, time_step) and updates robot
+        output_path: Video file to write (format chosen by ffmpeg from the extension)
+        frames: Number of frames to simulate and render
+        n_jobs: Number of worker processes used for rendering
+
+    Raises:
+        RuntimeError: If ffmpeg is not installed or fails to encode the video
+    """
+    # Check for ffmpeg up front rather than after simulating and rendering
+    ffmpeg_path = matplotlib.rcParams['animation.ffmpeg_path']
+    if shutil.which(ffmpeg_path) is None:
+        raise RuntimeError(f"ffmpeg not found ('{ffmpeg_path}'); install it or set "
+                           "matplotlib's animation.ffmpeg_path to save a video")
+
+    _init_worker()
+
+    print(f"   Simulating {frames} frames...")
+    states, path = simulate(search_algorithm, frames)
+
+    # A few chunks per worker keeps the pool busy while ffmpeg consumes frames in order
+    n_jobs = max(1, n_jobs)
+    chunk_size = max(1, -(-frames // (n_jobs * 4)))
+    starts = range(0, frames, chunk_size)
+    chunks = [states[start:start + chunk_size] for start in starts]
+
+    fps = 1000 / config.UPDATE_INTERVAL
+    command = [
+        ffmpeg_path, '-y', '-loglevel', 'error',
+        '-f', 'image2pipe', '-framerate', f'{fps:g}', '-c:v', 'png', '-i', '-',
+        '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p',
+        output_path
+    ]
+
+    print(f"   Rendering with {n_jobs} worker(s) to {output_path}...")
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker) as pool:
+        # Submit before starting ffmpeg so forked workers don't inherit its
+        # stdin pipe, which would keep ffmpeg from ever seeing end of input
+        rendered = pool.map(_render_chunk, starts, chunks, [path] * len(chunks))
+        with subprocess.Popen(command, stdin=subprocess.PIPE) as ffmpeg:
+            for pngs in rendered:
+                for png in pngs:
+                    ffmpeg.stdin.write(png)
+            ffmpeg.stdin.close()
+
+    if ffmpeg.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with status {ffmpeg.returncode}")
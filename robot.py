@@ -1,7 +1,24 @@
 """Robot class for URC search with camera field of view."""
 
+import math
 import numpy as np
-from typing import List, Tuple, Set, Callable, Optional
+from functools import lru_cache
+from typing import Tuple, Callable, NamedTuple, Optional
+
+
+@lru_cache(maxsize=64)
+def _sin_cos_deg(angle_degrees: float) -> Tuple[float, float]:
+    """Sine and cosine of an angle in degrees, cached for repeated turn steps."""
+    angle_rad = math.radians(angle_degrees)
+    return math.sin(angle_rad), math.cos(angle_rad)
+
+
+class RobotState(NamedTuple):
+    """Pose and path length captured by ``SearchRobot.snapshot``."""
+    x: float
+    y: float
+    heading: float
+    path_len: int
 
 
 class SearchRobot:
@@ -29,11 +46,79 @@ class SearchRobot:
         self.fov_vertical = fov_v
         self.camera_range = camera_range
         
-        # Path history
-        self.path: List[Tuple[float, float]] = [(self.x, self.y)]
+        # Path history, stored as growable x and y buffers. The first
+        # _path_recorded points are valid, which may be more than _path_len
+        # after restoring an earlier snapshot
+        self._path_x = np.empty(1024, dtype=np.float32)
+        self._path_y = np.empty(1024, dtype=np.float32)
+        self._path_len = 0
+        self._path_recorded = 0
+        self._push(self.x, self.y)
         
         # Search algorithm function
         self.search_function: Optional[Callable] = None
+        
+        # Pose at the last camera coverage update (see camera_coverage)
+        self._last_cov_pose: Optional[Tuple[float, float, float]] = None
+    
+    @property
+    def heading(self) -> float:
+        """Heading in degrees (0 = North/+Y, 90 = East/+X)."""
+        return self._heading
+    
+    @heading.setter
+    def heading(self, angle_degrees: float):
+        # Keep the heading's sine and cosine cached for move_forward. Absolute
+        # headings are arbitrary floats, so they skip the turn-step cache
+        self._heading = angle_degrees
+        heading_rad = math.radians(angle_degrees)
+        self._sinh = math.sin(heading_rad)
+        self._cosh = math.cos(heading_rad)
+    
+    @property
+    def path(self) -> np.ndarray:
+        """Positions visited so far as a new (N, 2) array of (x, y)."""
+        return np.column_stack(self.path_xy())
+    
+    def path_xy(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Views of the visited x and y coordinates, without copying."""
+        return self._path_x[:self._path_len], self._path_y[:self._path_len]
+    
+    def _push(self, x: float, y: float):
+        """Append a point to the path history, doubling the buffers when full."""
+        if self._path_len == len(self._path_x):
+            self._path_x = np.resize(self._path_x, 2 * len(self._path_x))
+            self._path_y = np.resize(self._path_y, 2 * len(self._path_y))
+        self._path_x[self._path_len] = x
+        self._path_y[self._path_len] = y
+        self._path_len += 1
+        # Points past a rewound path length have now been overwritten
+        self._path_recorded = self._path_len
+    
+    def load_path(self, path: np.ndarray):
+        """Replace the path history with an (N, 2) array of (x, y) points."""
+        self._path_x = np.array(path[:, 0], dtype=np.float32)
+        self._path_y = np.array(path[:, 1], dtype=np.float32)
+        self._path_len = self._path_recorded = len(path)
+    
+    def snapshot(self) -> RobotState:
+        """Capture the current pose and path length."""
+        return RobotState(self.x, self.y, self.heading, self._path_len)
+    
+    def restore(self, state: RobotState):
+        """
+        Return to a captured pose and path length.
+        
+        The path points themselves are not part of the snapshot, so the
+        path history must still (or, after ``load_path``, again) hold the
+        first ``state.path_len`` points.
+        """
+        if state.path_len > self._path_recorded:
+            raise ValueError(f"Path history holds fewer than {state.path_len} points")
+        self.x = state.x
+        self.y = state.y
+        self.heading = state.heading
+        self._path_len = state.path_len
     
     def set_search_algorithm(self, func: Callable):
         """
@@ -48,55 +133,25 @@ class SearchRobot:
         """Move robot by relative distance."""
         self.x += dx
         self.y += dy
-        self.path.append((self.x, self.y))
+        self._push(self.x, self.y)
     
     def move_forward(self, distance: float):
         """Move robot forward in current heading direction."""
-        heading_rad = np.radians(self.heading)
-        dx = distance * np.sin(heading_rad)
-        dy = distance * np.cos(heading_rad)
-        self.move(dx, dy)
+        self.move(distance * self._sinh, distance * self._cosh)
     
     def turn(self, angle_degrees: float):
         """Turn robot by angle in degrees (positive = clockwise)."""
-        self.heading = (self.heading + angle_degrees) % 360
+        # Rotate the cached heading vector instead of recomputing sin/cos
+        sin_d, cos_d = _sin_cos_deg(angle_degrees)
+        sin_h, cos_h = self._sinh, self._cosh
+        self._heading = (self._heading + angle_degrees) % 360
+        self._sinh = sin_h * cos_d + cos_h * sin_d
+        self._cosh = cos_h * cos_d - sin_h * sin_d
     
     def set_heading(self, angle_degrees: float):
         """Set absolute heading in degrees."""
         self.heading = angle_degrees % 360
     
-    def get_visible_cells(self, grid_size: float) -> Set[Tuple[int, int]]:
-        """
-        Calculate which grid cells are visible to the camera.
-        Returns set of (grid_x, grid_y) tuples.
-        """
-        visible_cells = set()
-        
-        # Convert heading to radians
-        heading_rad = np.radians(self.heading)
-        
-        # Calculate FOV cone boundaries (using horizontal FOV for 2D)
-        fov_rad = np.radians(self.fov_horizontal)
-        half_fov = fov_rad / 2
-        
-        # Sample points within the FOV cone
-        num_angle_samples = 20
-        num_distance_samples = int(self.camera_range / grid_size) + 1
-        
-        for angle_offset in np.linspace(-half_fov, half_fov, num_angle_samples):
-            direction_angle = heading_rad + angle_offset
-            
-            for distance in np.linspace(0, self.camera_range, num_distance_samples):
-                # Calculate point in world coordinates
-                px = self.x + distance * np.sin(direction_angle)
-                py = self.y + distance * np.cos(direction_angle)
-                
-                # Convert to grid coordinates (need to import from environment)
-                # We'll do this conversion in the step function
-                visible_cells.add((px, py))
-        
-        return visible_cells
-    
     def step(self, time_step: float):
         """Execute one time step of the search algorithm."""
         if self.search_function:
@@ -34,7 +34,7 @@ The `robot` object has these methods:
 - `robot.x, robot.y` - Current position
 - `robot.heading` - Current heading in degrees
 - `robot.speed` - Robot speed in m/s
-- `robot.path` - List of (x, y) positions visited
+- `robot.path` - (N, 2) array of (x, y) positions visited (`robot.path_xy()` gives x and y views without copying)
 - `robot.camera_range` - Camera range (3m for RealSense D435)
 - `robot.fov_horizontal` - Horizontal FOV (87° for RealSense D435)
 
@@ -133,10 +133,12 @@ def target_aware_search(robot: SearchRobot, time_step: float):
     """
     if not hasattr(robot, '_target_state'):
         # Define areas of interest (e.g., from competition hints)
+        search_radius = 2.0
         robot._target_state = {
-            'interest_points': [(5, 5), (-3, 7), (2, -6)],
+            'interest_points': np.array([(5, 5), (-3, 7), (2, -6)], dtype=np.float32),
             'current_target_idx': 0,
-            'search_radius': 2.0,
+            'search_radius_sq': search_radius * search_radius,
+            'target_heading': None,  # Heading toward the current target, once aimed
             'circling': False,
             'circle_angle': 0
         }
@@ -147,18 +149,20 @@ def target_aware_search(robot: SearchRobot, time_step: float):
     if state['current_target_idx'] < len(state['interest_points']):
         target_x, target_y = state['interest_points'][state['current_target_idx']]
         
-        # Calculate distance to target
+        # Compare squared distance to target (no sqrt needed)
         dx = target_x - robot.x
         dy = target_y - robot.y
-        distance = np.sqrt(dx**2 + dy**2)
         
-        if distance > state['search_radius']:
-            # Move toward target
-            target_angle = np.degrees(np.arctan2(dx, dy))
-            robot.set_heading(target_angle)
+        if dx * dx + dy * dy > state['search_radius_sq']:
+            # Move toward target; the heading only needs computing once per
+            # approach since the robot then drives straight at it
+            if state['target_heading'] is None:
+                state['target_heading'] = math.degrees(math.atan2(dx, dy))
+                robot.set_heading(state['target_heading'])
             robot.move_forward(robot.speed * time_step)
         else:
-            # Circle around target area
+            # Circle around target area; re-aim if circling carries us back out
+            state['target_heading'] = None
             if not state['circling']:
                 state['circling'] = True
             
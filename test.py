@@ -7,6 +7,8 @@ Run this to test without opening the GUI.
 import numpy as np
 from environment import SearchEnvironment
 from robot import SearchRobot
+from fov_kernels import shadowcast_fov, cone_overlap_block
+from camera_coverage import update_from_robot
 import config
 
 
@@ -26,6 +28,12 @@ def test_environment():
     world_x, world_y = env.grid_to_world(20, 20)
     assert abs(world_x) < 0.5 and abs(world_y) < 0.5, "Reverse conversion failed"
     
+    # Conversions work on arrays; cells left of the origin floor rather than truncate
+    grid_x, grid_y = env.world_to_grid(np.array([-10.2, -0.1, 9.9]), np.array([0.0, 0.0, 12.0]))
+    assert grid_x.tolist() == [-1, 19, 39] and grid_y.tolist() == [20, 20, 44], "Array conversion failed"
+    grid_x, grid_y = env.world_to_grid(np.array([-10.2, 9.9]), np.array([0.0, 12.0]), clip=True)
+    assert grid_x.tolist() == [0, 39] and grid_y.tolist() == [20, 39], "Clipped conversion failed"
+    
     # Test boundary checking
     assert env.is_within_search_area(0, 0), "Center should be in bounds"
     assert not env.is_within_search_area(15, 15), "Far corner should be out of bounds"
@@ -36,6 +44,38 @@ def test_environment():
     env.mark_cells_as_seen({(20, 20)})
     assert env.get_coverage_percentage() > 0, "Coverage should increase"
     
+    env.reset_coverage()
+    env.mark_cells_as_seen({(20, 20), (21, 20), (40, 20)})
+    assert env.coverage_grid[20, 20] and env.coverage_grid[20, 21], "Cell marking failed"
+    assert env.coverage_grid.sum() == 2, "Marking should only touch given in-bounds cells"
+    
+    env.reset_coverage()
+    env.mark_cells_as_seen_arr(np.array([20, 21]), np.array([20, 20]))
+    assert env.coverage_grid[20, 20] and env.coverage_grid[20, 21], "Array marking failed"
+    assert env.coverage_grid.sum() == env.seen_count == 2, "Array marking should only touch given cells"
+    
+    # Coverage bitmap spanning several 64-cell words
+    wide = SearchEnvironment(radius=20.0, grid_size=0.25)
+    wide.mark_cells_as_seen({(0, 5), (63, 5), (64, 80)})
+    wide.mark_cells_as_seen({(159, 159), (100, 80)})
+    seen = np.argwhere(wide.coverage_grid)
+    assert sorted(map(tuple, seen)) == [(5, 0), (5, 63), (80, 64), (80, 100), (159, 159)], \
+        f"Packed coverage round trip failed: {seen.tolist()}"
+    wide.coverage_grid = wide.coverage_grid
+    assert wide.coverage_grid.sum() == 5, "Assigning the grid back should keep coverage"
+    try:
+        wide.coverage_grid[0, 0] = True
+        assert False, "Item writes to the unpacked grid should fail"
+    except ValueError:
+        pass
+    
+    # Coverage snapshots restore both the bitmap and the running count
+    snapshot = wide.snapshot_coverage()
+    wide.mark_cells_as_seen({(80, 80)})
+    wide.restore_coverage(snapshot)
+    assert wide.coverage_grid.sum() == 5, "Restore should drop cells marked after the snapshot"
+    assert wide.seen_count == snapshot.seen_count, "Restore should bring back the seen count"
+    
     print("✓ SearchEnvironment tests passed\n")
 
 
@@ -67,9 +107,37 @@ def test_robot():
     # Test turn
     robot.turn(45)
     assert robot.heading == 135, f"Heading should be 135, got {robot.heading}"
+    robot.move_forward(1.0)
+    assert abs(robot.x - (1 + np.sqrt(0.5))) < 0.01, f"Robot should move south-east: x={robot.x}"
+    assert abs(robot.y - (1 - np.sqrt(0.5))) < 0.01, f"Robot should move south-east: y={robot.y}"
     
     # Test path tracking
     assert len(robot.path) > 2, "Robot should track path"
+    assert np.allclose(robot.path[-1], (robot.x, robot.y)), "Path should end at robot position"
+    
+    # Path buffer grows past its initial capacity
+    for _ in range(2000):
+        robot.move(0.0, 0.01)
+    assert len(robot.path) == 2004, f"Path should keep every point, got {len(robot.path)}"
+    assert np.allclose(robot.path[0], (0, 0)), "Path should keep its start point"
+    path_x, path_y = robot.path_xy()
+    assert len(path_x) == len(path_y) == 2004, "Path views should cover every point"
+    
+    # Snapshots rewind the pose and path, and replay onto a loaded path
+    state = robot.snapshot()
+    robot.move_forward(1.0)
+    robot.turn(90)
+    robot.restore(state)
+    assert robot.snapshot() == state and len(robot.path) == 2004, "Restore should rewind the robot"
+    try:
+        SearchRobot(0, 0, 1.0, 87, 58, 3.0).restore(state)
+        assert False, "Restore past the recorded path should raise"
+    except ValueError:
+        pass
+    replay = SearchRobot(0, 0, 1.0, 87, 58, 3.0)
+    replay.load_path(robot.path)
+    replay.restore(state._replace(path_len=10))
+    assert np.array_equal(replay.path, robot.path[:10]), "Replay should show the loaded path"
     
     print("✓ SearchRobot tests passed\n")
 
@@ -86,20 +154,26 @@ def test_integration():
         robot.move_forward(0.5)
         robot.turn(36)  # 10 steps = full circle
     
-    # Calculate visible cells (simplified)
+    # Calculate visible cells (simplified), sampling about once per grid cell
+    # along each ray and across the far arc
     heading_rad = np.radians(robot.heading)
     fov_rad = np.radians(robot.fov_horizontal)
-    visible = set()
+    n_radial = int(np.ceil(robot.camera_range / env.grid_size)) + 1
+    n_angular = int(np.ceil(robot.camera_range * fov_rad / env.grid_size)) + 1
+    angles = heading_rad + np.linspace(-fov_rad/2, fov_rad/2, n_angular)
+    dists = np.linspace(0, robot.camera_range, n_radial)
     
-    for angle_offset in np.linspace(-fov_rad/2, fov_rad/2, 10):
-        for dist in np.linspace(0, robot.camera_range, 10):
-            px = robot.x + dist * np.sin(heading_rad + angle_offset)
-            py = robot.y + dist * np.cos(heading_rad + angle_offset)
-            gx, gy = env.world_to_grid(px, py)
-            if env.is_within_bounds(gx, gy):
-                visible.add((gx, gy))
+    # All samples at once: (angles, distances) grids of world points
+    px = robot.x + np.outer(np.sin(angles), dists)
+    py = robot.y + np.outer(np.cos(angles), dists)
+    gx, gy = env.world_to_grid(px, py)
+    in_bounds = (gx >= 0) & (gx < env.grid_cells) & (gy >= 0) & (gy < env.grid_cells)
+    assert gx.dtype == np.int32 and in_bounds.any(), "Samples should land on the grid"
     
-    env.mark_cells_as_seen(visible)
+    # Scatter into a boolean scratch mask and OR it into coverage in one go
+    visible_mask = np.zeros((env.grid_cells, env.grid_cells), dtype=bool)
+    visible_mask[gy[in_bounds], gx[in_bounds]] = True
+    env.coverage_grid = env.coverage_grid | visible_mask
     coverage = env.get_coverage_percentage()
     
     assert coverage > 0, "Robot should have seen some area"
@@ -108,6 +182,80 @@ def test_integration():
     print(f"✓ Integration test passed (coverage: {coverage:.1f}%)\n")
 
 
+def test_fov_kernels():
+    """Test the compiled FOV shadowcaster."""
+    print("Testing FOV kernels...")
+    
+    env = SearchEnvironment(radius=10.0, grid_size=0.5)
+    rows = np.zeros_like(env._rows)
+    newly_seen = shadowcast_fov(0.0, 0.0, 0.0, np.radians(87) / 2, 0.3, 3.0,
+                                env.radius, env.grid_size, env.grid_cells,
+                                rows, env._circle_rows)
+    
+    env.mark_fov_cone(0.0, 0.0, 0.0, np.radians(87) / 2, 0.3, 3.0)
+    assert np.array_equal(rows, env._rows), "Environment should mark what the kernel marks"
+    assert newly_seen == env.seen_count == env.coverage_grid.sum() > 0, \
+        "Kernel should count the cells it marks"
+    
+    ahead_x, ahead_y = env.world_to_grid(0, 2)
+    behind_x, behind_y = env.world_to_grid(0, -2)
+    assert env.coverage_grid[ahead_y, ahead_x], "Cell ahead of camera should be seen"
+    assert not env.coverage_grid[behind_y, behind_x], "Cell behind camera should not be seen"
+    
+    far_x, far_y = env.world_to_grid(0, 3.6)
+    assert not env.coverage_grid[far_y, far_x], "Cell beyond camera range should not be seen"
+    edge_x, edge_y = env.world_to_grid(1.75, 1.75)
+    assert env.coverage_grid[edge_y, edge_x], "Cell partly inside the FOV should be seen"
+    side_x, side_y = env.world_to_grid(2, 0)
+    assert not env.coverage_grid[side_y, side_x], "Cell outside the FOV angle should not be seen"
+    
+    # The NumPy fallback marks the same cells as the shadowcaster
+    for x, y, heading in [(0.0, 0.0, 0.0), (1.3, -2.1, 200.0), (-9.5, 4.0, 313.5)]:
+        env.reset_coverage()
+        env.mark_fov_cone(x, y, np.radians(heading), np.radians(87) / 2, 0.3, 3.0)
+        block_env = SearchEnvironment(radius=10.0, grid_size=0.5)
+        block_env.mark_block_as_seen(*cone_overlap_block(x, y, np.radians(heading),
+                                                         np.radians(87) / 2, 0.3, 3.0,
+                                                         env.radius, env.grid_size,
+                                                         env.grid_cells))
+        assert np.array_equal(block_env.coverage_grid, env.coverage_grid), \
+            "NumPy fallback should mark the same cells as the kernel"
+        assert block_env.seen_count == env.seen_count, "NumPy fallback should count the same cells"
+    
+    print("✓ FOV kernel tests passed\n")
+
+
+def test_coverage_update():
+    """Test coverage updates from the robot's camera."""
+    print("Testing coverage update...")
+    
+    env = SearchEnvironment(radius=10.0, grid_size=0.5)
+    robot = SearchRobot(0, 0, 1.0, 87, 58, 3.0)
+    
+    update_from_robot(env, robot)
+    assert env.get_coverage_percentage() > 0, "Camera view should be marked as seen"
+    
+    # Unchanged pose skips the update
+    env.reset_coverage()
+    robot.turn(0.5)
+    update_from_robot(env, robot)
+    assert env.get_coverage_percentage() == 0, "Update should be skipped for a tiny turn"
+    
+    robot.move_forward(1.0)
+    update_from_robot(env, robot)
+    assert env.get_coverage_percentage() > 0, "Update should run after moving"
+    
+    # The running seen count matches a full recount of the circle
+    for _ in range(20):
+        robot.move_forward(0.7)
+        robot.turn(25)
+        update_from_robot(env, robot)
+    recount = (env.coverage_grid & env.circle_mask).sum()
+    assert env.seen_count == recount, f"Seen count drifted: {env.seen_count} vs {recount}"
+    
+    print("✓ Coverage update tests passed\n")
+
+
 def test_config():
     """Test configuration values."""
     print("Testing configuration...")
@@ -131,6 +279,8 @@ if __name__ == "__main__":
         test_environment()
         test_robot()
         test_integration()
+        test_fov_kernels()
+        test_coverage_update()
         
         print("=" * 60)
         print("✅ ALL TESTS PASSED!")
@@ -1,9 +1,13 @@
 """Visualization for URC robot search with 2D and 3D views."""
 
+import math
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.patches import Circle, Wedge, Rectangle
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Circle, Wedge
+from matplotlib.transforms import Affine2D
 from mpl_toolkits.mplot3d import Axes3D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
 from typing import Optional
 
 from environment import SearchEnvironment
@@ -18,6 +22,14 @@ class SearchVisualizer:
         self.environment = environment
         self.robot = robot
         
+        # Cells inside the circular search area and their world-space centers,
+        # fixed by the grid geometry so computed once for both views
+        rows, cols = np.indices((environment.grid_cells, environment.grid_cells))
+        xs, ys = environment.grid_to_world(cols, rows)
+        self._valid_mask = environment.circle_mask
+        self._valid_xs = xs[self._valid_mask]
+        self._valid_ys = ys[self._valid_mask]
+        
         # Create figure with two subplots
         self.fig = plt.figure(figsize=(16, 7))
         self.ax_2d = self.fig.add_subplot(121)  # 2D top-down view
@@ -25,6 +37,8 @@ class SearchVisualizer:
         
         self._setup_2d_plot()
         self._setup_3d_plot()
+        self._create_2d_artists()
+        self._create_3d_artists()
         
         plt.tight_layout()
     
@@ -55,199 +69,286 @@ class SearchVisualizer:
         
         # Set viewing angle
         self.ax_3d.view_init(elev=30, azim=45)
+        
+        # Draw in zorder rather than by projected depth: the coverage layers
+        # overlap each other and the robot, and depth sorting would put the
+        # unseen base on top of them in full (non-blitted) draws
+        self.ax_3d.computed_zorder = False
+        
+        # Draw search boundary cylinder (static, drawn once)
+        self._theta = np.linspace(0, 2*np.pi, 50, dtype=np.float32)
+        self._cyl_xs = (config.SEARCH_RADIUS * np.cos(self._theta)).astype(np.float32)
+        self._cyl_ys = (config.SEARCH_RADIUS * np.sin(self._theta)).astype(np.float32)
+        self._cyl_zs_bot = np.zeros_like(self._theta)
+        self._cyl_zs_top = np.full_like(self._theta, 0.5)
+        
+        # Vertical lines for cylinder, batched into one collection
+        bottoms = np.stack([self._cyl_xs, self._cyl_ys, self._cyl_zs_bot], axis=-1)[::5]
+        tops = np.stack([self._cyl_xs, self._cyl_ys, self._cyl_zs_top], axis=-1)[::5]
+        self.cylinder_sides_3d = Line3DCollection(np.stack([bottoms, tops], axis=1),
+                                                  colors='cyan', alpha=0.3, linewidths=0.5)
+        self.ax_3d.add_collection3d(self.cylinder_sides_3d, autolim=False)
+        
+        # Draw top and bottom circles; the bottom one lies under the coverage cells
+        self.cylinder_bottom_3d, = self.ax_3d.plot(self._cyl_xs, self._cyl_ys, self._cyl_zs_bot,
+                                                   'cyan', alpha=0.5, linewidth=1.5, zorder=0.5)
+        self.cylinder_top_3d, = self.ax_3d.plot(self._cyl_xs, self._cyl_ys, self._cyl_zs_top,
+                                                'cyan', alpha=0.5, linewidth=1.5)
     
-    def update(self, frame: int):
-        """Update visualization."""
-        self.ax_2d.clear()
-        self.ax_3d.clear()
-        self._setup_2d_plot()
-        self._setup_3d_plot()
+    def _create_2d_artists(self):
+        """
+        Create the 2D artists once; later frames only update their data.
+        
+        Everything that changes per frame is marked animated so it stays out
+        of the cached background when the animation blits.
+        """
+        radius = self.environment.radius
+        
+        # Coverage grid as a single RGBA image. Cells are categorised as
+        # 0 = outside the search circle, 1 = unseen, 2 = seen, and mapped
+        # through a uint8 colour lookup table, so drawing skips the colormap
+        self._cell_lut = np.round(255 * np.array([
+            (0.0, 0.0, 0.0, 0.0),
+            to_rgba(config.UNSEEN_COLOR, 0.8),
+            to_rgba(config.SEEN_COLOR, 0.6),
+        ])).astype(np.uint8)
+        self._valid_u8 = self._valid_mask.astype(np.uint8)
+        self._cell_categories = np.empty_like(self._valid_u8)
+        self.coverage_im = self.ax_2d.imshow(
+            self._coverage_image(),
+            origin='lower', extent=(-radius, radius, -radius, radius),
+            interpolation='nearest', animated=True)
+        
+        # Camera FOV cone as a wedge out to max range. Its path is built once,
+        # centered on the origin and facing +X; each frame only rotates and
+        # translates it through _fov_transform
+        half_fov = config.CAMERA_FOV_HORIZONTAL / 2
+        self._fov_transform = Affine2D()
+        self.fov_wedge = Wedge((0, 0), config.CAMERA_MAX_RANGE, -half_fov, half_fov,
+                               facecolor='cyan', alpha=0.2,
+                               edgecolor='cyan', linewidth=1.5, animated=True,
+                               transform=self._fov_transform + self.ax_2d.transData)
+        self.fov_wedge.set_visible(config.SHOW_FOV_CONE)
+        self.ax_2d.add_patch(self.fov_wedge)
+        
+        # Search boundary drawn on top of the coverage image
+        self.boundary = Circle((0, 0), config.SEARCH_RADIUS,
+                               fill=False, edgecolor='cyan', linewidth=2, linestyle='--',
+                               animated=True)
+        self.ax_2d.add_patch(self.boundary)
+        
+        # Robot path
+        self.path_line, = self.ax_2d.plot([], [], 'yellow', linewidth=2,
+                                          alpha=0.7, label='Path', animated=True)
+        self.path_line.set_visible(config.SHOW_ROBOT_PATH)
+        
+        # Info text
+        self.info_text = self.ax_2d.text(0.02, 0.98, '',
+                                         transform=self.ax_2d.transAxes,
+                                         fontsize=10, verticalalignment='top',
+                                         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8),
+                                         animated=True)
+        
+        # Robot and heading indicator
+        self.robot_marker = Circle((self.robot.x, self.robot.y), 0.3,
+                                   facecolor=config.ROBOT_COLOR, edgecolor='white',
+                                   linewidth=2, zorder=10, animated=True)
+        self.ax_2d.add_patch(self.robot_marker)
+        self.heading_arrow = self.ax_2d.arrow(self.robot.x, self.robot.y, 0, 0.6,
+                                              head_width=0.3, head_length=0.2,
+                                              fc='white', ec='white', linewidth=2, zorder=11,
+                                              animated=True)
+    
+    def _create_3d_artists(self):
+        """Create the 3D artists once (animated); later frames only update their data."""
+        # Coverage cells as flat quads, one (cells, 4, 3) vertex array for the
+        # cells inside the search circle, drawn as a heatmap rather than bars
+        half = self.environment.grid_size / 2
+        corner_x = np.array([-half, half, half, -half])
+        corner_y = np.array([-half, -half, half, half])
+        self._cell_quads = np.zeros((len(self._valid_xs), 4, 3))
+        self._cell_quads[..., 0] = self._valid_xs[:, None] + corner_x
+        self._cell_quads[..., 1] = self._valid_ys[:, None] + corner_y
+        
+        # Every cell as an unseen quad. This layer never changes, so it is not
+        # animated and stays in the cached blit background
+        self._cell_quads[..., 2] = 0.05
+        self.coverage_base_3d = Poly3DCollection(self._cell_quads.copy(),
+                                                 facecolors=[to_rgba(config.UNSEEN_COLOR, 0.8)],
+                                                 edgecolors='none', zorder=1)
+        self.ax_3d.add_collection3d(self.coverage_base_3d, autolim=False)
+        
+        # Seen cells as raised quads on top. Newly seen cells are appended to
+        # _seen_quads, whose first _n_seen_drawn entries are the overlay's verts
+        self._cell_quads[..., 2] = 0.1
+        self._seen_drawn = np.zeros(len(self._valid_xs), dtype=bool)
+        self._seen_quads = np.empty_like(self._cell_quads)
+        self._n_seen_drawn = 0
+        self._seen_count_drawn = 0
+        self.coverage_3d = Poly3DCollection([], facecolors=[to_rgba(config.SEEN_COLOR, 0.7)],
+                                            edgecolors='none', zorder=2, animated=True)
+        self.ax_3d.add_collection3d(self.coverage_3d, autolim=False)
+        
+        # Robot body outline around the origin, shifted to the robot each frame
+        robot_theta = np.linspace(0, 2*np.pi, 20, dtype=np.float32)
+        self._robot_circle_xs = 0.3 * np.cos(robot_theta)
+        self._robot_circle_ys = 0.3 * np.sin(robot_theta)
+        self._robot_circle_zs = np.zeros_like(robot_theta)
         
+        # Robot body, cone lines and heading indicator
+        self.robot_base_3d, = self.ax_3d.plot([], [], [], config.ROBOT_COLOR, linewidth=2,
+                                              zorder=3, animated=True)
+        self.robot_cone_3d = Line3DCollection([], colors=config.ROBOT_COLOR, alpha=0.6,
+                                              linewidths=1, zorder=3, animated=True)
+        self.ax_3d.add_collection3d(self.robot_cone_3d, autolim=False)
+        self._robot_cone_segs = np.zeros((len(self._robot_circle_xs[::3]), 2, 3))
+        self.robot_heading_3d, = self.ax_3d.plot([], [], [], 'white', linewidth=3, marker='o',
+                                                 zorder=4, animated=True)
+        
+        # Coverage percentage text
+        self.coverage_text_3d = self.ax_3d.text2D(0.05, 0.95, '',
+                                                  transform=self.ax_3d.transAxes,
+                                                  fontsize=11, fontweight='bold',
+                                                  bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8),
+                                                  animated=True)
+    
+    def _coverage_image(self):
+        """Coverage grid as an (N, N, 4) uint8 RGBA image."""
+        # Category = 1 for cells in the circle, plus 1 more once seen
+        np.add(self._valid_u8, self.environment.coverage_grid & self._valid_mask,
+               out=self._cell_categories, casting='unsafe')
+        return self._cell_lut[self._cell_categories]
+    
+    def init_plot(self):
+        """
+        Draw the initial state and return the animated artists.
+        
+        Suitable as the ``init_func`` of a blitting ``FuncAnimation``.
+        """
+        return self.update(0)
+    
+    def update(self, frame: int, force_3d: bool = False):
+        """
+        Update visualization and return the animated artists.
+        
+        The 2D view is updated every frame and the 3D view only every
+        ``config.REDRAW_3D_EVERY`` frames. The 3D artists are returned on
+        every frame all the same: a blitting animation restores each axes'
+        background before drawing, so leaving them out would blank them.
+        
+        Args:
+            frame: Animation frame number
+            force_3d: Update the 3D view on this frame regardless of the
+                throttle, e.g. when every frame is drawn in full
+        """
         # Update 2D view
         self._draw_2d_view()
         
-        # Update 3D view
-        self._draw_3d_view()
+        # Update 3D view; in between, its artists are redrawn unchanged
+        if force_3d or frame % config.REDRAW_3D_EVERY == 0:
+            self._draw_3d_view()
         
-        return self.ax_2d, self.ax_3d
+        return (self.coverage_im, self.fov_wedge, self.boundary, self.path_line,
+                self.info_text, self.robot_marker, self.heading_arrow,
+                self.coverage_3d, self.robot_base_3d, self.robot_cone_3d,
+                self.robot_heading_3d, self.coverage_text_3d)
     
     def _draw_2d_view(self):
-        """Draw 2D top-down view with grid coverage."""
-        # Draw grid cells
-        for i in range(self.environment.grid_cells):
-            for j in range(self.environment.grid_cells):
-                x, y = self.environment.grid_to_world(j, i)
-                
-                # Only draw cells within search radius
-                if not self.environment.is_within_search_area(x, y):
-                    continue
-                
-                # Determine color based on coverage
-                if self.environment.coverage_grid[i, j]:
-                    color = config.SEEN_COLOR
-                    alpha = 0.6
-                else:
-                    color = config.UNSEEN_COLOR
-                    alpha = 0.8
-                
-                # Draw grid cell
-                rect = Rectangle((x - config.GRID_SIZE/2, y - config.GRID_SIZE/2),
-                               config.GRID_SIZE, config.GRID_SIZE,
-                               facecolor=color, edgecolor='gray', 
-                               linewidth=0.1, alpha=alpha)
-                self.ax_2d.add_patch(rect)
-        
-        # Draw robot path
-        if config.SHOW_ROBOT_PATH and len(self.robot.path) > 1:
-            path_array = np.array(self.robot.path)
-            self.ax_2d.plot(path_array[:, 0], path_array[:, 1], 
-                          'yellow', linewidth=2, alpha=0.7, label='Path')
-        
-        # Draw camera FOV cone
+        """Update 2D top-down view with grid coverage."""
+        # Update grid cells
+        self.coverage_im.set_data(self._coverage_image())
+        
+        # Update robot path
+        if config.SHOW_ROBOT_PATH:
+            self.path_line.set_data(*self.robot.path_xy())
+        
+        # Update camera FOV cone
         if config.SHOW_FOV_CONE:
             self._draw_fov_cone_2d()
         
-        # Draw robot
-        robot_marker = Circle((self.robot.x, self.robot.y), 0.3,
-                             facecolor=config.ROBOT_COLOR, edgecolor='white',
-                             linewidth=2, zorder=10)
-        self.ax_2d.add_patch(robot_marker)
-        
-        # Draw heading indicator
-        heading_rad = np.radians(self.robot.heading)
-        dx = 0.6 * np.sin(heading_rad)
-        dy = 0.6 * np.cos(heading_rad)
-        self.ax_2d.arrow(self.robot.x, self.robot.y, dx, dy,
-                        head_width=0.3, head_length=0.2, 
-                        fc='white', ec='white', linewidth=2, zorder=11)
-        
-        # Add info text
+        # Update robot
+        self.robot_marker.set_center((self.robot.x, self.robot.y))
+        
+        # Update heading indicator
+        heading_rad = math.radians(self.robot.heading)
+        dx = 0.6 * math.sin(heading_rad)
+        dy = 0.6 * math.cos(heading_rad)
+        self.heading_arrow.set_data(x=self.robot.x, y=self.robot.y, dx=dx, dy=dy)
+        
+        # Update info text
         coverage = self.environment.get_coverage_percentage()
         info_text = f'Coverage: {coverage:.1f}%\n'
         info_text += f'Position: ({self.robot.x:.1f}, {self.robot.y:.1f})m\n'
         info_text += f'Heading: {self.robot.heading:.0f}°'
-        
-        self.ax_2d.text(0.02, 0.98, info_text,
-                       transform=self.ax_2d.transAxes,
-                       fontsize=10, verticalalignment='top',
-                       bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
-        
-        # Re-add boundary
-        boundary = Circle((0, 0), config.SEARCH_RADIUS,
-                         fill=False, edgecolor='cyan', linewidth=2, linestyle='--')
-        self.ax_2d.add_patch(boundary)
+        self.info_text.set_text(info_text)
     
     def _draw_fov_cone_2d(self):
-        """Draw camera field of view cone in 2D."""
-        # Robot heading: 0° = North (+Y), 90° = East (+X)
-        # Matplotlib Wedge: 0° = East (+X), angles go counter-clockwise
-        # Conversion: matplotlib_angle = 90 - robot_heading
-        
-        fov_half = config.CAMERA_FOV_HORIZONTAL / 2
-        center_angle_mpl = 90 - self.robot.heading
-        
-        start_angle = center_angle_mpl - fov_half
-        end_angle = center_angle_mpl + fov_half
-        
-        # Draw FOV wedge
-        wedge = Wedge((self.robot.x, self.robot.y), config.CAMERA_MAX_RANGE,
-                     start_angle, end_angle,
-                     facecolor='cyan', alpha=0.2, edgecolor='cyan', linewidth=1.5)
-        self.ax_2d.add_patch(wedge)
+        """Update camera field of view cone in 2D."""
+        # Robot heading: 0° = North (+Y), 90° = East (+X); the wedge faces +X
+        # and rotates counter-clockwise
+        transform = self._fov_transform.clear().rotate_deg(90 - self.robot.heading)
+        transform.translate(self.robot.x, self.robot.y)
     
     def _draw_3d_view(self):
-        """Draw 3D view with coverage visualization."""
-        # Draw base grid as bars
-        for i in range(self.environment.grid_cells):
-            for j in range(self.environment.grid_cells):
-                x, y = self.environment.grid_to_world(j, i)
-                
-                if not self.environment.is_within_search_area(x, y):
-                    continue
-                
-                # Determine height and color
-                if self.environment.coverage_grid[i, j]:
-                    height = 0.1
-                    color = config.SEEN_COLOR
-                    alpha = 0.7
-                else:
-                    height = 0.05
-                    color = config.UNSEEN_COLOR
-                    alpha = 0.8
-                
-                # Draw as 3D bar
-                self._draw_3d_bar(x, y, 0, config.GRID_SIZE, config.GRID_SIZE, 
-                                height, color, alpha)
-        
-        # Draw robot as cone/pyramid
+        """Update 3D view with coverage visualization."""
+        # Update the seen overlay only when the seen count has changed
+        if self.environment.seen_count != self._seen_count_drawn:
+            self._seen_count_drawn = self.environment.seen_count
+            self._update_seen_overlay()
+        
+        # Update robot cone/pyramid
         self._draw_robot_3d()
         
-        # Draw search boundary cylinder
-        theta = np.linspace(0, 2*np.pi, 50)
-        x_circle = config.SEARCH_RADIUS * np.cos(theta)
-        y_circle = config.SEARCH_RADIUS * np.sin(theta)
-        z_bottom = np.zeros_like(theta)
-        z_top = np.ones_like(theta) * 0.5
-        
-        # Draw vertical lines for cylinder
-        for i in range(0, len(theta), 5):
-            self.ax_3d.plot([x_circle[i], x_circle[i]], 
-                           [y_circle[i], y_circle[i]],
-                           [z_bottom[i], z_top[i]], 
-                           'cyan', alpha=0.3, linewidth=0.5)
-        
-        # Draw top and bottom circles
-        self.ax_3d.plot(x_circle, y_circle, z_bottom, 'cyan', alpha=0.5, linewidth=1.5)
-        self.ax_3d.plot(x_circle, y_circle, z_top, 'cyan', alpha=0.5, linewidth=1.5)
-        
-        # Add coverage percentage text
+        # Update coverage percentage text
         coverage = self.environment.get_coverage_percentage()
-        self.ax_3d.text2D(0.05, 0.95, f'Coverage: {coverage:.1f}%',
-                         transform=self.ax_3d.transAxes,
-                         fontsize=11, fontweight='bold',
-                         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+        self.coverage_text_3d.set_text(f'Coverage: {coverage:.1f}%')
     
-    def _draw_3d_bar(self, x, y, z, dx, dy, dz, color, alpha):
-        """Draw a 3D bar (rectangular prism)."""
-        # Define vertices of a cube
-        xx = [x - dx/2, x + dx/2]
-        yy = [y - dy/2, y + dy/2]
-        zz = [z, z + dz]
-        
-        # Draw bottom and top faces
-        for z_val in zz:
-            xs = [xx[0], xx[1], xx[1], xx[0], xx[0]]
-            ys = [yy[0], yy[0], yy[1], yy[1], yy[0]]
-            zs = [z_val] * 5
-            self.ax_3d.plot(xs, ys, zs, color=color, alpha=alpha, linewidth=0.5)
+    def _update_seen_overlay(self):
+        """Append the quads of newly seen cells to the 3D seen overlay."""
+        seen = self.environment.coverage_grid[self._valid_mask]
+        if (self._seen_drawn & ~seen).any():
+            # Coverage was reset or replaced; start the overlay over
+            self._seen_drawn[:] = False
+            self._n_seen_drawn = 0
+        
+        new_quads = self._cell_quads[seen & ~self._seen_drawn]
+        start, stop = self._n_seen_drawn, self._n_seen_drawn + len(new_quads)
+        self._seen_quads[start:stop] = new_quads
+        self._n_seen_drawn = stop
+        self._seen_drawn |= seen
+        
+        self.coverage_3d.set_verts(self._seen_quads[:stop])
+        # Collections are only projected during a full axes draw, so project
+        # here to keep the blitted frames in sync
+        self.coverage_3d.do_3d_projection()
     
     def _draw_robot_3d(self):
-        """Draw robot as a 3D shape."""
-        # Draw robot body as a cylinder/cone
+        """Update robot 3D shape."""
+        # Robot body as a cylinder/cone
         robot_height = 0.5
-        robot_radius = 0.3
         
-        # Create cone for robot body
-        theta = np.linspace(0, 2*np.pi, 20)
-        x_base = self.robot.x + robot_radius * np.cos(theta)
-        y_base = self.robot.y + robot_radius * np.sin(theta)
-        z_base = np.zeros_like(theta)
+        # Create cone for robot body from the precomputed base circle
+        x_base = self.robot.x + self._robot_circle_xs
+        y_base = self.robot.y + self._robot_circle_ys
+        z_base = self._robot_circle_zs
         
-        # Draw base circle
-        self.ax_3d.plot(x_base, y_base, z_base, config.ROBOT_COLOR, linewidth=2)
+        # Base circle
+        self.robot_base_3d.set_data_3d(x_base, y_base, z_base)
         
-        # Draw lines to top point (heading direction)
-        heading_rad = np.radians(self.robot.heading)
-        top_x = self.robot.x + 0.2 * np.sin(heading_rad)
-        top_y = self.robot.y + 0.2 * np.cos(heading_rad)
+        # Lines to top point (heading direction)
+        heading_rad = math.radians(self.robot.heading)
+        top_x = self.robot.x + 0.2 * math.sin(heading_rad)
+        top_y = self.robot.y + 0.2 * math.cos(heading_rad)
         top_z = robot_height
         
-        for i in range(0, len(theta), 3):
-            self.ax_3d.plot([x_base[i], top_x], [y_base[i], top_y], 
-                           [z_base[i], top_z], config.ROBOT_COLOR, 
-                           alpha=0.6, linewidth=1)
+        segs = self._robot_cone_segs
+        segs[:, 0, 0] = x_base[::3]
+        segs[:, 0, 1] = y_base[::3]
+        segs[:, 0, 2] = z_base[::3]
+        segs[:, 1] = (top_x, top_y, top_z)
+        self.robot_cone_3d.set_segments(segs)
+        self.robot_cone_3d.do_3d_projection()
         
-        # Draw heading arrow on top
-        self.ax_3d.plot([self.robot.x, top_x], [self.robot.y, top_y], 
-                       [top_z, top_z], 'white', linewidth=3, marker='o')
-
+        # Heading arrow on top
+        self.robot_heading_3d.set_data_3d([self.robot.x, top_x], [self.robot.y, top_y],
+                                          [top_z, top_z])